@@ -1,12 +1,13 @@
 # app.py
 import os
-import json
-import tempfile
-import subprocess
-import shutil
-from typing import Optional, List, Any
+import hmac
+import asyncio
+from typing import Optional, List, Any, BinaryIO, Callable
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Body, Form
+import orjson
+
+from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Body, Form, Depends
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 # .env 로드 (실패해도 무시)
@@ -16,12 +17,19 @@ try:
 except Exception:
     pass
 
+from pipeline import run_pipeline, load_input_fileobj, _get_processor  # 파이프라인은 프로세스 안에서 직접 호출
+
 API_KEY = os.getenv("AI_API_KEY")                          # 없으면 인증 생략
-PY_CMD = os.getenv("PY_CMD", "python")                     # 윈도우/리눅스 호환
-RUN_SCRIPT = os.getenv("RUN_SCRIPT", "run_all.py")         # 파이프라인 엔트리
+_EXPECTED_AUTH = f"Bearer {API_KEY}".encode() if API_KEY else None
 DEBUG = os.getenv("DEBUG", "0").lower() in ("1", "true", "yes")
+PIPELINE_ENTRY = "pipeline.run_pipeline"                   # 응답의 "script" 키 (예전엔 RUN_SCRIPT 경로)
+
+app = FastAPI(title="Hackathon AI Pipeline API", version="1.0.0", default_response_class=ORJSONResponse)  # ← 반드시 'app'
 
-app = FastAPI(title="Hackathon AI Pipeline API", version="1.0.0")  # ← 반드시 'app'
+@app.on_event("startup")
+def _warm_processor():
+    # 첫 요청 전에 Processor 를 만들어 두어 워커 스레드 간 중복 생성을 막는다
+    _get_processor()
 
 # -----------------------------
 # Pydantic 스키마 (수신 전용)
@@ -38,9 +46,14 @@ class RunRequest(BaseModel):
 # 공통 함수
 # -----------------------------
 def _check_auth(authorization: Optional[str]):
-    if API_KEY and authorization != f"Bearer {API_KEY}":
+    # 상수 시간 비교 (응답 시간으로 키를 추측하지 못하게)
+    if _EXPECTED_AUTH and not hmac.compare_digest((authorization or "").encode(), _EXPECTED_AUTH):
         raise HTTPException(status_code=401, detail="unauthorized")
 
+def require_auth(authorization: Optional[str] = Header(None)):
+    """엔드포인트 공통 인증 의존성 (Depends 로 주입)"""
+    _check_auth(authorization)
+
 def _coerce_item_keys(d: dict) -> dict:
     """
     백엔드가 주는 다양한 키 이름을 파이프라인 표준키로 통일.
@@ -84,7 +97,7 @@ def _normalize_payload_for_pipeline(input_payload: Any) -> Any:
     # 1) 문자열이면 JSON 파싱
     if isinstance(input_payload, str):
         try:
-            input_payload = json.loads(input_payload)
+            input_payload = orjson.loads(input_payload)
         except Exception:
             raise HTTPException(status_code=400, detail="Body is a string but not valid JSON")
 
@@ -93,7 +106,7 @@ def _normalize_payload_for_pipeline(input_payload: Any) -> Any:
         for key in ("runjson", "data", "payload"):
             if key in input_payload and isinstance(input_payload[key], str):
                 try:
-                    input_payload = json.loads(input_payload[key])
+                    input_payload = orjson.loads(input_payload[key])
                 except Exception:
                     raise HTTPException(status_code=400, detail=f"'{key}' is not valid JSON string")
 
@@ -131,39 +144,29 @@ def _normalize_payload_for_pipeline(input_payload: Any) -> Any:
     # 그 외는 그대로 (파이프라인이 처리)
     return input_payload
 
-def _run_pipeline(input_payload: Any) -> Any:
-    with tempfile.TemporaryDirectory() as td:
-        in_path = os.path.join(td, "input.json")
-        out_path = os.path.join(td, "output.json")
-
-        payload = _normalize_payload_for_pipeline(input_payload)
-
-        with open(in_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
-
-        p = subprocess.run(
-            [PY_CMD, RUN_SCRIPT, in_path, out_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-        )
-
-        if p.returncode != 0:
-            raise HTTPException(
-                status_code=500,
-                detail=f"pipeline failed (code {p.returncode}). log:\n{p.stdout[-4000:]}"
-            )
+async def _call_pipeline(fn: Callable[[Any], Any], arg: Any) -> Any:
+    """파이프라인을 워커 스레드에서 실행해 이벤트 루프를 막지 않는다."""
+    try:
+        out = await asyncio.to_thread(fn, arg)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"pipeline failed: {type(e).__name__}: {e}")
+
+    if DEBUG:
+        # 예전 키 유지: 서브프로세스가 없으니 log_tail 은 항상 빈 문자열
+        return {"output": out, "log_tail": "", "script": PIPELINE_ENTRY, "count": len(out)}
+    return out
 
-        if not os.path.exists(out_path):
-            raise HTTPException(status_code=500, detail="output.json not found")
+def _run_payload(input_payload: Any) -> Any:
+    # 문자열 JSON 파싱/키 보정까지 워커 스레드에서 (큰 본문이 루프를 막지 않게)
+    return run_pipeline(_normalize_payload_for_pipeline(input_payload))
 
-        with open(out_path, "r", encoding="utf-8") as f:
-            out = json.load(f)
+async def _run_pipeline(input_payload: Any) -> Any:
+    return await _call_pipeline(_run_payload, input_payload)
 
-        if DEBUG:
-            # 파이프라인 로그 꼬리와 함께 반환 (원인 추적 용이)
-            return {"output": out, "log_tail": p.stdout[-4000:], "script": RUN_SCRIPT}
-        return out
+def _run_upload(f: BinaryIO) -> Any:
+    return run_pipeline(load_input_fileobj(f))
 
 # -----------------------------
 # 헬스/레디
@@ -176,7 +179,7 @@ def healthz():
 def readyz():
     return {
         "ready": True,
-        "script": RUN_SCRIPT,
+        "script": PIPELINE_ENTRY,
         "GROQ_API_KEY_set": bool(os.getenv("GROQ_API_KEY")),
         "GROQ_MODEL": os.getenv("GROQ_MODEL"),
     }
@@ -184,61 +187,28 @@ def readyz():
 # -----------------------------
 # 실행 엔드포인트들
 # -----------------------------
-@app.post("/run/json")
-async def run_json(
-    payload: Any = Body(..., media_type="application/json"),
-    authorization: Optional[str] = Header(None),
-):
+@app.post("/run/json", dependencies=[Depends(require_auth)])
+async def run_json(payload: Any = Body(..., media_type="application/json")):
     """
     - Content-Type: application/json
     - 허용 입력: {"items":[...]} / [...] / {"runjson":"..."} / {"data":"..."} / {"payload":"..."} / "JSON문자열"
     """
-    _check_auth(authorization)
-    return _run_pipeline(payload)
+    return await _run_pipeline(payload)
 
-@app.post("/run/raw")
-async def run_raw(
-    runjson: str = Form(..., description="JSON string"),
-    authorization: Optional[str] = Header(None),
-):
+@app.post("/run/raw", dependencies=[Depends(require_auth)])
+async def run_raw(runjson: str = Form(..., description="JSON string")):
     """
     - Content-Type: application/x-www-form-urlencoded 또는 multipart/form-data
     - 필드명 runjson 에 JSON 문자열을 담아 전송
     """
-    _check_auth(authorization)
     try:
-        data = json.loads(runjson)
+        data = orjson.loads(runjson)
     except Exception:
         raise HTTPException(status_code=400, detail="runjson is not valid JSON")
-    return _run_pipeline(data)
-
-@app.post("/run/file")
-def run_file(file: UploadFile = File(...), authorization: Optional[str] = Header(None)):
-    _check_auth(authorization)
-    with tempfile.TemporaryDirectory() as td:
-        in_path = os.path.join(td, file.filename or "input.json")
-        out_path = os.path.join(td, "output.json")
-        with open(in_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
-
-        p = subprocess.run(
-            [PY_CMD, RUN_SCRIPT, in_path, out_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True
-        )
-        if p.returncode != 0:
-            raise HTTPException(
-                status_code=500,
-                detail=f"pipeline failed (code {p.returncode}). log:\n{p.stdout[-4000:]}"
-            )
-
-        if not os.path.exists(out_path):
-            raise HTTPException(status_code=500, detail="output.json not found")
-
-        with open(out_path, "r", encoding="utf-8") as f:
-            out = json.load(f)
+    return await _run_pipeline(data)
 
-        if DEBUG:
-            return {"output": out, "log_tail": p.stdout[-4000:], "script": RUN_SCRIPT}
-        return out
+@app.post("/run/file", dependencies=[Depends(require_auth)])
+async def run_file(file: UploadFile = File(...)):
+    # 업로드는 Starlette 가 이미 스풀 파일로 받아 둠 → 통째로 메모리에 올리지 않고 스레드에서 바로 읽는다
+    await file.seek(0)
+    return await _call_pipeline(_run_upload, file.file)
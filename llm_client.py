@@ -5,22 +5,147 @@ GROQ(API) 또는 OPENAI 호환 엔드포인트와 대화하여 JSON을 반환하
 - GROQ_API_KEY (필수)
 - MODEL (기본: llama-3.1-8b-instant)
 - GROQ_BASE_URL (옵션, 기본: https://api.groq.com/openai/v1)
+- LLM_CACHE_PATH (옵션, 지정 시 기사별 결과를 sqlite 파일에 캐시해 재실행 때 재사용)
+- LLM_CACHE_SIZE (옵션, 메모리 캐시 건수, 기본 4096)
+- LLM_RPM (옵션, 분당 최대 호출 수, 기본 500, 0 이면 제한 없음)
 LLM이 없으면 LLMUnavailable 예외로 알리고, 상위에서 백업 규칙 사용.
 """
 
 import os
 import json
 import time
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 class LLMUnavailable(Exception):
     pass
 
+_DECODER = json.JSONDecoder()
+
+def _parse_json_object(txt: str) -> dict:
+    # JSON 모드 응답은 그대로 파싱되고, 앞뒤에 잡음이 있으면 첫 '{' 부터 객체 하나만 디코딩
+    try:
+        return orjson.loads(txt)
+    except orjson.JSONDecodeError:
+        start = txt.find("{")
+        if start == -1:
+            raise
+        obj, _ = _DECODER.raw_decode(txt, start)
+        return obj
+
+class RateLimiter:
+    """토큰 버킷: 분당 rpm 회까지 호출을 허용하고, 넘치면 토큰이 찰 때까지 기다린다(스레드 안전)."""
+
+    def __init__(self, rpm: int):
+        self.rate = rpm / 60.0
+        self.capacity = max(1.0, self.rate)  # 최대 1초치 버스트
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class _ResponseCache:
+    """기사 키 해시 → 결과 JSON 텍스트. 메모리 LRU 위에 선택적으로 sqlite 영속 캐시를 둔다."""
+
+    def __init__(self, path: str = "", maxsize: int = 4096):
+        # 메모리 LRU 와 sqlite 는 잠금을 따로 둔다(디스크 대기가 메모리 조회를 막지 않도록)
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self._maxsize = maxsize
+        self._db = None
+        if path:
+            try:
+                # 캐시는 없어도 되므로 다른 프로세스가 잠가 두었으면 오래 기다리지 않는다
+                self._db = sqlite3.connect(path, timeout=1.0, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, json TEXT)")
+                self._db.commit()
+            except sqlite3.Error:
+                self._db = None
+
+    @staticmethod
+    def key(*parts) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for p in parts:
+            h.update(str(p).encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            txt = self._mem.get(key)
+            if txt is not None:
+                self._mem.move_to_end(key)
+                return txt
+        if self._db is None:
+            return None
+        # 읽기 실패(잠금 등)는 캐시 미스로 취급
+        try:
+            with self._db_lock:
+                row = self._db.execute("SELECT json FROM cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        with self._lock:
+            self._remember(key, row[0])
+        return row[0]
+
+    def put(self, key: str, txt: str) -> None:
+        with self._lock:
+            self._remember(key, txt)
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute("INSERT OR REPLACE INTO cache (key, json) VALUES (?, ?)", (key, txt))
+                self._db.commit()
+        except sqlite3.Error:
+            pass
+
+    def _remember(self, key: str, txt: str) -> None:
+        self._mem[key] = txt
+        self._mem.move_to_end(key)
+        if len(self._mem) > self._maxsize:
+            self._mem.popitem(last=False)
+
 class LLMClient:
     def __init__(self, api_key: str, model: str, base_url: str = "https://api.groq.com/openai/v1"):
         self.api_key = api_key
         self.model = model
         self.base_url = base_url.rstrip("/")
+        # keep-alive 로 TCP/TLS 연결을 재사용 (호출마다 핸드셰이크 방지)
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        })
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # 기사별 결과 캐시: 중복 기사나 재실행 때 이미 받은 기사는 다시 보내지 않는다
+        self._cache = _ResponseCache(os.getenv("LLM_CACHE_PATH", ""), int(os.getenv("LLM_CACHE_SIZE", "4096")))
+        # 여러 스레드가 동시에 호출해도 API 호출 한도를 넘지 않도록
+        self._limiter = RateLimiter(int(os.getenv("LLM_RPM", "500")))
 
     @classmethod
     def from_env(cls) -> "LLMClient":
@@ -31,40 +156,53 @@ class LLMClient:
         base = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
         return cls(api_key, model, base)
 
-    def _chat(self, prompt: str, max_tokens: int = 512) -> str:
+    def _chat(self, prompt: str, max_tokens: int = 512, temperature: float = 0.2) -> str:
         url = f"{self.base_url}/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
         payload = {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": "You are a precise JSON generator. Never include markdown fences."},
                 {"role": "user", "content": prompt},
             ],
-            "temperature": 0.2,
+            "temperature": temperature,
             "max_tokens": max_tokens,
+            # JSON 모드: 모델이 설명문/코드펜스 없이 JSON 객체 하나만 내도록 강제
+            "response_format": {"type": "json_object"},
         }
-        resp = requests.post(url, headers=headers, json=payload, timeout=60)
+        self._limiter.acquire()
+        # 본문도 orjson 으로 직렬화(Content-Type 은 세션 헤더에 설정됨)
+        resp = self._session.post(url, data=orjson.dumps(payload), timeout=60)
         if resp.status_code >= 400:
             raise RuntimeError(f"LLM HTTP {resp.status_code}: {resp.text[:200]}")
-        data = resp.json()
+        data = orjson.loads(resp.content)
         return data["choices"][0]["message"]["content"]
 
-    def json_chat(self, prompt: str, max_tokens: int = 512) -> dict:
+    def result_key(self, task: str, text: Optional[str], title: Optional[str]) -> str:
+        """(모델, 작업, 제목+본문) 으로 기사 한 건의 캐시 키를 만든다."""
+        return _ResponseCache.key(self.model, task, title or "", text or "")
+
+    def cached_result(self, key: str) -> Optional[dict]:
+        txt = self._cache.get(key)
+        if txt is None:
+            return None
+        try:
+            js = orjson.loads(txt)
+        except orjson.JSONDecodeError:
+            return None
+        return js if isinstance(js, dict) else None
+
+    def store_result(self, key: str, result: dict) -> None:
+        self._cache.put(key, orjson.dumps(result).decode("utf-8"))
+
+    def json_chat(self, prompt: str, max_tokens: int = 512, temperature: float = 0.2) -> dict:
         # 재시도 2회
         last_err = None
         for _ in range(2):
             try:
-                txt = self._chat(prompt, max_tokens=max_tokens)
-                # JSON만 남도록 앞뒤 잡음 제거
-                start = txt.find("{")
-                end = txt.rfind("}")
-                if start != -1 and end != -1 and end >= start:
-                    txt = txt[start:end+1]
-                return json.loads(txt)
+                txt = self._chat(prompt, max_tokens=max_tokens, temperature=temperature)
+                return _parse_json_object(txt)
             except Exception as e:
                 last_err = e
                 time.sleep(0.8)
         raise last_err
+
@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
 import json
 import re
 import sys
 import shutil
+import contextlib
+from collections import deque
+from html import unescape as _unescape
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, List, Optional
 
-from processors import build_processor, safe_debug
+import orjson
+
+from processors import DEBUG, build_processor, safe_debug
 
 # ---- .env 로드 ----
 try:
@@ -18,13 +26,9 @@ try:
 except Exception as e:
     safe_debug(f"[pipeline] .env load skipped ({e})")
 
-# __pycache__ 정리
-for cache_dir in Path(".").rglob("__pycache__"):
-    try:
-        shutil.rmtree(cache_dir)
-        print(f"[CLEAN] __pycache__ 삭제: {cache_dir}")
-    except Exception as e:
-        print(f"[WARN] __pycache__ 삭제 실패: {cache_dir} ({e})")
+# LLM 한 번 호출에 묶을 기사 수 / 동시에 보낼 배치 수(Groq 레이트리밋 고려)
+LLM_BATCH = max(1, int(os.getenv("LLM_BATCH", "8")))
+LLM_CONCURRENCY = max(1, int(os.getenv("LLM_CONCURRENCY", "20")))
 
 # ---------------- 공통 유틸 ----------------
 
@@ -40,6 +44,18 @@ def _read_text_any_encoding(path: Path) -> str:
             exc = e
     raise exc
 
+def _decode_any_encoding(data: bytes) -> str:
+    """업로드 바이트를 utf-8 → utf-8-sig → cp949 순으로 시도해 디코딩한다."""
+    exc = None
+    for enc in ("utf-8", "utf-8-sig", "cp949"):
+        try:
+            s = data.decode(enc)
+            safe_debug(f"[pipeline] decoded with {enc}")
+            return s
+        except Exception as e:
+            exc = e
+    raise exc
+
 # 후보 키들
 _CAND_LIST_KEYS = ["items", "data", "list", "rows", "results", "records", "news", "articles"]
 _TEXT_KEYS = ["contents", "content", "text", "body", "description", "desc", "article", "contentBody", "content_html", "html"]
@@ -48,57 +64,98 @@ _TITLE_KEYS = ["title", "headline", "subject", "name"]
 def _is_item_dict(d: Dict[str, Any]) -> bool:
     if not isinstance(d, dict):
         return False
-    return any((k in d) and isinstance(d[k], (str, bytes)) for k in _TEXT_KEYS)
-
-def _extract_candidate_items_anywhere(node: Any, found: List[Dict[str, Any]]):
-    """중첩 구조 어디서든 텍스트가 있는 dict 리스트를 찾아준다."""
-    if isinstance(node, list):
-        ok = [x for x in node if isinstance(x, dict)]
-        if ok and any(_is_item_dict(x) for x in ok):
-            found.extend(ok)
-            return
-        for x in node:
-            _extract_candidate_items_anywhere(x, found)
-    elif isinstance(node, dict):
-        # 흔한 리스트 키 먼저 확인
-        for key in _CAND_LIST_KEYS:
-            v = node.get(key)
-            if isinstance(v, list):
-                ok = [x for x in v if isinstance(x, dict)]
-                if ok and any(_is_item_dict(x) for x in ok):
-                    found.extend(ok)
-                else:
-                    _extract_candidate_items_anywhere(v, found)
-        # 나머지 값도 재귀
-        for v in node.values():
-            _extract_candidate_items_anywhere(v, found)
+    return any(isinstance(d.get(k), (str, bytes)) for k in _TEXT_KEYS)
+
+def _item_dicts(node: List[Any]) -> List[Dict[str, Any]]:
+    """리스트 안 dict 중 하나라도 본문 키를 가지면 dict 전체를, 아니면 빈 리스트."""
+    ok = [x for x in node if isinstance(x, dict)]
+    if ok and any(_is_item_dict(x) for x in ok):
+        return ok
+    return []
+
+def _extract_candidate_items_anywhere(root: Any) -> List[Dict[str, Any]]:
+    """중첩 구조 어디서든 텍스트가 있는 dict 리스트를 찾아준다(얕은 곳부터, 처음 찾은 리스트)."""
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        if isinstance(node, list):
+            found = _item_dicts(node)
+            if found:
+                return found
+            queue.extend(x for x in node if isinstance(x, (list, dict)))
+        elif isinstance(node, dict):
+            # 흔한 리스트 키 먼저 확인
+            for key in _CAND_LIST_KEYS:
+                v = node.get(key)
+                if isinstance(v, list):
+                    found = _item_dicts(v)
+                    if found:
+                        return found
+            # 나머지 값은 다음 깊이에서
+            queue.extend(v for v in node.values() if isinstance(v, (list, dict)))
+    return []
 
 # ---------------- HTML 처리 ----------------
 
+# selectolax(lexbor, C 파서)가 있으면 정규식 여러 번 대신 한 번의 파싱으로 처리
+try:
+    from selectolax.lexbor import LexborHTMLParser as _HTMLParser
+except ImportError:
+    _HTMLParser = None
+
+# 끝에 줄바꿈을 넣는 블록 요소
+_BLOCK_TAGS = "p, div, li, tr, h1, h2, h3, h4, h5, h6, blockquote"
+
+# 1차: script/style 블록(→ 공백) | <br>, </p> (→ 줄바꿈) 를 한 번의 스캔으로, 2차: 남은 태그(→ 공백)
+# 남은 태그를 1차에 합치면 짝 없는 '<' 가 뒤의 <br>/</p> 까지 삼켜 결과가 달라지므로 나눠 둔다
+_HTML_BLOCK_RX = re.compile(r"<(script|style).*?>.*?</\1>|(<br\s*/?>|</p\s*>)", re.IGNORECASE | re.DOTALL)
+_ANY_TAG_RX = re.compile(r"<.*?>", re.DOTALL)
+_WS_RX = re.compile(r"[ \t]+")
+_LINE_EDGE_WS_RX = re.compile(r"[ \t]*\n[ \t]*")
+_NL_RX = re.compile(r"\n\s*\n\s*\n+")
+
+def _html_repl(m: re.Match) -> str:
+    return "\n" if m.group(2) else " "
+
+def _regex_strip_html(html: str) -> str:
+    return _unescape(_ANY_TAG_RX.sub(" ", _HTML_BLOCK_RX.sub(_html_repl, html)))
+
 def _local_strip_html(html: str) -> str:
     if not html:
         return ""
-    text = re.sub(r"<(script|style).*?>.*?</\1>", " ", html, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</p\s*>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<.*?>", " ", text, flags=re.DOTALL)
-    from html import unescape as _unescape
-    text = _unescape(text)
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
+    if _HTMLParser is not None:
+        tree = _HTMLParser(html)
+        for tag in tree.css("script, style"):
+            tag.decompose()
+        # 줄바꿈은 <br> 과 블록 요소 끝에만 넣고, 인라인 태그(<b>, <a> 등) 사이 텍스트는 그대로 잇는다
+        for tag in tree.css("br"):
+            tag.replace_with("\n")
+        for tag in tree.css(_BLOCK_TAGS):
+            tag.insert_after("\n")
+        for tag in tree.css("td, th"):
+            tag.insert_after(" ")
+        text = _LINE_EDGE_WS_RX.sub("\n", tree.text(separator=""))
+    else:
+        text = _regex_strip_html(html)
+    text = _WS_RX.sub(" ", text)
+    text = _NL_RX.sub("\n\n", text)
     return text.strip()
 
-try:
-    import transform as _t
-    if hasattr(_t, "strip_html"):
-        strip_html = _t.strip_html
-        safe_debug("[pipeline] transform.strip_html 사용")
-    else:
-        strip_html = _local_strip_html
-        safe_debug("[pipeline] transform 모듈에 strip_html 없음 → 로컬 함수 사용")
-except Exception as e:
+if _HTMLParser is not None:
     strip_html = _local_strip_html
-    safe_debug(f"[pipeline] transform 임포트 실패({e}) → 로컬 함수 사용")
+    safe_debug("[pipeline] selectolax 파서 사용")
+else:
+    try:
+        import transform as _t
+        if hasattr(_t, "strip_html"):
+            strip_html = _t.strip_html
+            safe_debug("[pipeline] transform.strip_html 사용")
+        else:
+            strip_html = _local_strip_html
+            safe_debug("[pipeline] transform 모듈에 strip_html 없음 → 로컬 함수 사용")
+    except Exception as e:
+        strip_html = _local_strip_html
+        safe_debug(f"[pipeline] transform 임포트 실패({e}) → 로컬 함수 사용")
 
 _TAG_RX = re.compile(r"<[a-zA-Z][^>]*>")
 def _has_html(s: str) -> bool:
@@ -110,6 +167,8 @@ def _coerce_id(v):
     s = str(v).strip()
     return s or None
 
+_KEY_NORM_RX = re.compile(r"[^a-z0-9]")
+
 def _get_news_id(item: dict):
     exact_keys = [
         "NewsItemId", "news_item_id",
@@ -118,13 +177,12 @@ def _get_news_id(item: dict):
         "id",
     ]
     for k in exact_keys:
-        if k in item:
-            v = _coerce_id(item.get(k))
-            if v:
-                return v
+        v = _coerce_id(item.get(k))
+        if v:
+            return v
     # 느슨한 탐지
     for k, v in item.items():
-        key_norm = re.sub(r"[^a-z0-9]", "", k.lower())
+        key_norm = _KEY_NORM_RX.sub("", k.lower())
         if ("news" in key_norm and "id" in key_norm) or ("identify" in key_norm and "id" in key_norm):
             vv = _coerce_id(v)
             if vv:
@@ -133,6 +191,14 @@ def _get_news_id(item: dict):
 
 # ---------------- 핵심: 입력 로더(다중 루트/배열 연속/JSONL 보정) ----------------
 
+# ijson 이 있으면 큰 입력 파일을 스트리밍으로 읽는다
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_JSON_WS_RX = re.compile(r"\s*")
+
 def _parse_multiple_json_values(text: str) -> List[Any]:
     """
     파일에 JSON 값이 여러 개 연달아 붙은 경우 전부 파싱.
@@ -142,22 +208,20 @@ def _parse_multiple_json_values(text: str) -> List[Any]:
     i = 0
     n = len(text)
     values = []
-    while i < n:
+    while True:
         # 공백 스킵
-        while i < n and text[i].isspace():
-            i += 1
+        i = _JSON_WS_RX.match(text, i).end()
         if i >= n:
             break
         try:
-            val, j = dec.raw_decode(text, i)
+            val, i = dec.raw_decode(text, i)
             values.append(val)
-            i = j
         except json.JSONDecodeError:
-            # 흔한 오염: 인접 배열 `][` 또는 `] [`
-            if i + 1 < n and ((text[i] == ']' and text[i+1] == '[') or (text[i:i+2] == '] ' and i + 2 < n and text[i+2] == '[')):
-                safe_debug("[pipeline] detected adjacent arrays while decoding → injecting ','")
-                text = text[:i] + ',' + text[i+1:]
-                n = len(text)
+            # 흔한 오염: 인접 배열 사이에 남은 `]` (`]][`, `]] [`) → 구분자로 보고 건너뜀
+            j = _JSON_WS_RX.match(text, i + 1).end()
+            if text[i] == ']' and j < n and text[j] == '[':
+                safe_debug("[pipeline] detected adjacent arrays while decoding → skipping stray ']'")
+                i += 1
                 continue
             # 더 진행 불가
             raise
@@ -187,6 +251,30 @@ def _merge_values_into_items(values: List[Any]) -> List[Dict[str, Any]]:
         # 문자열/숫자 등은 무시
     return items
 
+def _stream_items(f: BinaryIO) -> Optional[List[Dict[str, Any]]]:
+    """
+    가장 흔한 [...] / {"items":[...]} 입력은 ijson 으로 아이템 단위로 읽는다.
+    원문 문자열과 전체 트리를 동시에 들고 있지 않아 큰 파일에서 메모리가 절반.
+    형태가 다르거나(JSONL, 다중 루트, cp949 등) 실패하면 None → 일반 로더 사용.
+    f 는 seek 가능한 바이너리 파일 객체.
+    """
+    if ijson is None:
+        return None
+    try:
+        head = f.read(64).lstrip()
+        prefix = {b"{": "items.item", b"[": "item"}.get(head[:1])
+        if prefix is None:
+            return None
+        f.seek(0)
+        items = [x for x in ijson.items(f, prefix, use_float=True) if isinstance(x, dict)]
+    except Exception as e:
+        safe_debug(f"[pipeline] ijson 스트리밍 불가 → 일반 로더 사용 ({type(e).__name__})")
+        return None
+    if not items:
+        return None
+    safe_debug(f"[pipeline] ijson 스트리밍으로 {len(items)}개 읽음")
+    return items
+
 def _load_input(path: Path) -> List[Dict[str, Any]]:
     """
     지원:
@@ -197,7 +285,28 @@ def _load_input(path: Path) -> List[Dict[str, Any]]:
     - 깊은 중첩에서도 본문 키가 보이는 dict 리스트를 재귀 탐색
     - JSON 파싱 실패 시: 전체를 단일 본문으로 간주
     """
-    text = _read_text_any_encoding(path)
+    with path.open("rb") as f:
+        items = _stream_items(f)
+    if items is not None:
+        return items
+    return _parse_input_text(_read_text_any_encoding(path))
+
+def load_input_bytes(data: bytes) -> List[Dict[str, Any]]:
+    """업로드 파일 바이트를 _load_input 과 같은 규칙으로 아이템 리스트로 변환."""
+    return _parse_input_text(_decode_any_encoding(data))
+
+def load_input_fileobj(f: BinaryIO) -> List[Dict[str, Any]]:
+    """
+    업로드 파일 객체를 _load_input 과 같은 규칙으로 변환.
+    흔한 형태는 파일에서 바로 스트리밍하고, 나머지만 바이트로 읽어 들인다.
+    """
+    items = _stream_items(f)
+    if items is not None:
+        return items
+    f.seek(0)
+    return load_input_bytes(f.read())
+
+def _parse_input_text(text: str) -> List[Dict[str, Any]]:
     raw = text.strip()
     if not raw:
         return []
@@ -206,7 +315,7 @@ def _load_input(path: Path) -> List[Dict[str, Any]]:
     if raw.lstrip().startswith("{") and "\n" in raw:
         lines = [ln for ln in raw.splitlines() if ln.strip()]
         try:
-            parsed = [json.loads(ln) for ln in lines]
+            parsed = [orjson.loads(ln) for ln in lines]
             if parsed and all(isinstance(x, dict) for x in parsed):
                 safe_debug("[pipeline] JSONL 모드로 파싱")
                 return parsed
@@ -216,7 +325,7 @@ def _load_input(path: Path) -> List[Dict[str, Any]]:
     values: List[Any] = []
     # 1차: 한 방에 파싱
     try:
-        data = json.loads(raw)
+        data = orjson.loads(raw)
         values = [data]
     except Exception:
         # 실패 → 다중 값 파서 (][, }{ 등)
@@ -228,11 +337,18 @@ def _load_input(path: Path) -> List[Dict[str, Any]]:
             safe_debug("[pipeline] JSON 파싱 실패 → plain text 단일 아이템으로 처리")
             return [{"title": "", "text": raw}]
 
+    return _collect_items(values, raw)
+
+def _collect_items(values: List[Any], raw: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    파싱된 값들에서 뉴스 아이템을 뽑는다.
+    raw 가 없으면(이미 파싱된 페이로드) 재파싱 단계는 건너뛴다.
+    """
     # 1차 머지
     items = _merge_values_into_items(values)
 
     # ★ 추가: 최상위가 '빈 리스트'로만 읽힌 경우 재시도
-    if not items and values and isinstance(values[0], list) and len(values[0]) == 0:
+    if raw is not None and not items and values and isinstance(values[0], list) and len(values[0]) == 0:
         safe_debug("[pipeline] top-level empty list → 다중 값 파서로 재시도")
         try:
             values = _parse_multiple_json_values(raw)
@@ -242,8 +358,7 @@ def _load_input(path: Path) -> List[Dict[str, Any]]:
 
     # 그래도 없으면 래핑/딥서치
     if not items and values and isinstance(values[0], dict):
-        found: List[Dict[str, Any]] = []
-        _extract_candidate_items_anywhere(values[0], found)
+        found = _extract_candidate_items_anywhere(values[0])
         if found:
             safe_debug(f"[pipeline] 딥서치로 {len(found)}개 추출")
             items = found
@@ -253,32 +368,53 @@ def _load_input(path: Path) -> List[Dict[str, Any]]:
 
     # ★ 최후수단: 여전히 0개면 raw 전체를 단일 본문으로 변환
     if not items:
+        if raw is None:
+            return []
         safe_debug("[pipeline] items=0 → raw를 단일 본문으로 강제 변환")
         return [{"title": "", "text": raw}]
 
-    safe_debug(f"[pipeline] raw_items={len(items)} (샘플 keys: {list(items[0].keys()) if items else 'N/A'})")
+    if DEBUG:
+        safe_debug(f"[pipeline] raw_items={len(items)} (샘플 keys: {list(items[0].keys()) if items else 'N/A'})")
     return items
 
 # ---------------- 정규화 ----------------
 
+# 이보다 적으면 스레드 분배 비용이 더 크다
+_PARALLEL_STRIP_MIN_ITEMS = 4
+
+def _strip_all(contents: List[str]) -> List[str]:
+    # selectolax 파서는 파싱 중 GIL 을 놓으므로 여러 코어로 나눠 처리.
+    # 정규식 경로는 GIL 을 잡고 있어 스레드 이득이 없으니 순차 처리.
+    if strip_html is _local_strip_html and _HTMLParser is not None and len(contents) >= _PARALLEL_STRIP_MIN_ITEMS:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            return list(ex.map(strip_html, contents))
+    return [strip_html(c) for c in contents]
+
 def _normalize_items(items: List[Dict[str, Any]]):
-    norm = []
+    picked = []
     for it in items:
         # title 후보
         title = ""
         for k in _TITLE_KEYS:
-            if k in it and isinstance(it[k], str):
-                title = it[k]
+            v = it.get(k)
+            if isinstance(v, str):
+                title = v
                 break
 
         # 본문 후보
         contents = ""
         for k in _TEXT_KEYS:
-            if k in it and isinstance(it[k], str):
-                contents = it[k]
+            v = it.get(k)
+            if isinstance(v, str):
+                contents = v
                 break
 
-        plain = strip_html(contents)
+        picked.append((it, title, contents))
+
+    plains = _strip_all([contents for _, _, contents in picked])
+
+    norm = []
+    for (it, title, contents), plain in zip(picked, plains):
         norm.append({
             "NewsItemId": _get_news_id(it),
             "title": title,
@@ -297,52 +433,87 @@ def _pad4(xs: List[str]) -> List[str]:
 
 # ---------------- 메인 ----------------
 
-def main():
-    if len(sys.argv) != 3:
-        print("사용법: python pipeline.py <input.json|.jsonl> <output.json>")
-        sys.exit(1)
-
-    in_path = Path(sys.argv[1])
-    out_path = Path(sys.argv[2])
+def _clean_pycache():
+    """__pycache__ 정리 (CLI 에서 CLEAN_PYCACHE=1 일 때만)"""
+    for cache_dir in Path(".").rglob("__pycache__"):
+        try:
+            shutil.rmtree(cache_dir)
+            print(f"[CLEAN] __pycache__ 삭제: {cache_dir}", file=sys.stderr)
+        except Exception as e:
+            print(f"[WARN] __pycache__ 삭제 실패: {cache_dir} ({e})", file=sys.stderr)
 
-    if not in_path.exists():
-        print(f"[ERROR] 입력 파일을 찾을 수 없습니다: {in_path}")
-        sys.exit(2)
+@lru_cache(maxsize=1)
+def _get_processor():
+    """Processor(LLM 클라이언트 포함)는 프로세스당 한 번만 만든다."""
+    return build_processor()
 
-    raw_items = _load_input(in_path)
+def run_pipeline(items: Any) -> List[Dict[str, Any]]:
+    """
+    이미 파싱된 입력(아이템 리스트 또는 {"items":[...]} 등)을 받아 결과 리스트를 반환.
+    API 서버가 프로세스 생성/임시 파일 없이 직접 호출한다.
+    """
+    raw_items = _collect_items([items])
     norm_items = _normalize_items(raw_items)
-    safe_debug(f"[pipeline] norm_items={len(norm_items)} (첫 item 본문 길이: {len(norm_items[0].get('plain_text','')) if norm_items else 0})")
+    if DEBUG:
+        safe_debug(f"[pipeline] norm_items={len(norm_items)} (첫 item 본문 길이: {len(norm_items[0].get('plain_text','')) if norm_items else 0})")
 
-    proc = build_processor()
-    results = []
+    proc = _get_processor()
+    pairs = [(item.get("plain_text", ""), item.get("title")) for item in norm_items]
+    processed = proc.process_batch(pairs, batch_size=LLM_BATCH, max_workers=LLM_CONCURRENCY)
 
-    total = len(norm_items)
-    for i, item in enumerate(norm_items, start=1):
-        safe_debug(f"[{i}/{total}] 처리 중: {item.get('title','(제목없음)')}")
-        text = item.get("plain_text", "")
-        title = item.get("title")
-
-        summary_lines = proc.summarize(text, title=title) or []
-        primary_cat, subcats = proc.classify(text, title=title)
-        region = proc.detect_region(text, title=title) or "전국"
-
-        results.append({
+    return [
+        {
             "NewsItemId": item.get("NewsItemId"),
             "title": item.get("title"),
-            "summary": "\n".join(summary_lines[:3]),
-            "summary_lines": summary_lines[:3],
-            "category": primary_cat,
-            "subcategories": _pad4(subcats),
-            "region": region,
+            "summary": "\n".join(res["summary_lines"]),
+            "summary_lines": res["summary_lines"],
+            "category": res["category"],
+            "subcategories": _pad4(res["subcategories"]),
+            "region": res["region"],
             "source_meta": {
                 "has_html": item.get("has_html", False),
                 "length_chars": len(text),
             },
-        })
+        }
+        for item, (text, _), res in zip(norm_items, pairs, processed)
+    ]
 
+def main(in_arg: Optional[str] = None, out_arg: Optional[str] = None) -> int:
+    """CLI 진입점. run_all.py 처럼 같은 프로세스에서 main(입력, 출력) 으로도 호출할 수 있다."""
+    if in_arg is None or out_arg is None:
+        if len(sys.argv) != 3:
+            print("사용법: python pipeline.py <input.json|.jsonl|-> <output.json|->  ('-' 는 stdin/stdout)")
+            return 1
+        in_arg, out_arg = sys.argv[1], sys.argv[2]
+
+    if os.getenv("CLEAN_PYCACHE") == "1":
+        _clean_pycache()
+
+    to_stdout = out_arg == "-"
+    # stdout 으로 결과를 낼 때는 로그가 섞이지 않도록 stderr 로 돌린다
+    with contextlib.redirect_stdout(sys.stderr if to_stdout else sys.stdout):
+        if in_arg == "-":
+            raw_items = load_input_bytes(sys.stdin.buffer.read())
+        else:
+            in_path = Path(in_arg)
+            if not in_path.exists():
+                print(f"[ERROR] 입력 파일을 찾을 수 없습니다: {in_path}")
+                return 2
+            raw_items = _load_input(in_path)
+
+        results = run_pipeline(raw_items)
+
+    if to_stdout:
+        sys.stdout.buffer.write(orjson.dumps(results))
+        sys.stdout.buffer.flush()
+        return 0
+
+    out_path = Path(out_arg)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    # orjson 은 바로 UTF-8 bytes 를 만든다 (str 생성 후 재인코딩 없음)
+    out_path.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     print(f"[OK] 결과 저장: {out_path} (items={len(results)})")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 import os
 import re
+import sys
 import json
-from collections import Counter
-from typing import List, Tuple, Dict, Optional
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Callable, List, Tuple, Dict, Optional
 
 try:
     from dotenv import load_dotenv
@@ -11,11 +14,19 @@ try:
 except Exception:
     pass
 
+# 선택 의존성: 지역/분류 키워드를 한 번에 찾는 Aho-Corasick 오토마톤
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from llm_client import LLMClient, LLMUnavailable
 
 DEBUG = os.getenv("DEBUG", "0").lower() in ("1", "true", "yes")
 MIN_TEXT_CHARS = int(os.getenv("MIN_TEXT_CHARS", "50"))
 MAX_SUMMARY_LINES = 3
+# 프롬프트에 넣는 본문 최대 길이(룰베이스/지역 감지는 전체 본문을 쓴다)
+_PROMPT_TEXT_CHARS = 7000
 
 # ======================
 #   카테고리 정의(틀 유지)
@@ -37,6 +48,8 @@ _CATEGORY_GUIDE: Dict[str, str] = {
     "사회": "지역 행사/축제/문화/복지/교육, 재난/안전/보건, 시민 대상 서비스",
     "기타": "상기 어디에도 명확히 속하지 않는 경우"
 }
+# 프롬프트에 넣을 가이드 문자열은 한 번만 만든다
+_CATEGORY_GUIDE_JSON = json.dumps(_CATEGORY_GUIDE, ensure_ascii=False, indent=2)
 
 # 서브카테고리 힌트(LLM 참고용)
 _SUBCATEGORY_HINTS = [
@@ -61,16 +74,141 @@ _REGION_ALIASES: Dict[str, str] = {
     "제주도": "제주", "수도권": "경기",
 }
 
+# pyahocorasick 이 있으면 별칭/지역명을 오토마톤 하나로 묶어 본문을 한 번만 훑는다
+# 값은 (우선순위, 지역): 별칭(dict 순서) → 지역명(list 순서) 순으로 기존 루프와 같은 결과
+if ahocorasick is not None:
+    _REGION_AC = ahocorasick.Automaton()
+    for _i, (_alias, _base) in enumerate(_REGION_ALIASES.items()):
+        _REGION_AC.add_word(_alias, (_i, _base))
+    for _i, _kw in enumerate(_REGION_KWS, start=len(_REGION_ALIASES)):
+        _REGION_AC.add_word(_kw, (_i, _kw))
+    _REGION_AC.make_automaton()
+else:
+    _REGION_AC = None
+
+# 오토마톤이 없을 때: 별칭/지역명 각각 하나의 alternation 으로 훑고 목록 순서가 가장 앞선 것을 고른다
+_REGION_ALIAS_RX = re.compile("|".join(map(re.escape, sorted(_REGION_ALIASES, key=len, reverse=True))))
+_REGION_KW_RX = re.compile("|".join(map(re.escape, sorted(_REGION_KWS, key=len, reverse=True))))
+_REGION_ALIAS_PRIO = {alias: i for i, alias in enumerate(_REGION_ALIASES)}
+_REGION_KW_PRIO = {kw: i for i, kw in enumerate(_REGION_KWS)}
+
+# 정규식은 모듈 로드 시 한 번만 컴파일
+_RX_END = re.compile(r"[.!?]$")
+_RX_END_KO = re.compile(r"(다|요|합니다|이다)$")
+_RX_TOKEN_SPLIT = re.compile(r"[^0-9A-Za-z가-힣]+")
+_RX_SCORE_DATE = re.compile(r"\d{4}년|\d+월|\d+일|\d+%")
+_RX_SCORE_NUM = re.compile(r"[0-9][0-9,\.]{0,6}")
+_RX_SCORE_ORG = re.compile(r"(부|청|처|원|공사|위원회|정부|부처)")
+_RX_SCORE_ACT = re.compile(r"(지원|확대|개선|도입|발표|시행|확정|투자|수출|안전|출시)")
+
+# 분류 키워드 그룹(_fallback_classify / _debias_primary 공용, 소문자 텍스트에 부분 문자열로 매칭)
+_KW_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "fin": ("대출", "은행", "보험", "카드", "신용", "금감원", "채무조정", "연체", "보험료", "금융지원", "보조금", "세제"),
+    "fin_debias": ("보험", "대출", "연체", "금융", "펀드", "증권", "보조금", "세제"),
+    "safety": ("산업재해", "산재", "중대재해", "노동안전", "안전사고", "산업안전"),
+    "safety_debias": ("산업재해", "산재", "중대재해", "산업안전"),
+    "export": ("수출", "무역", "해외", "글로벌", "fta"),
+    "rnd": ("r&d", "연구", "기술", "ai", "인공지능", "혁신", "디지털전환"),
+    "hr": ("채용", "고용", "임금", "노사", "근로시간"),
+    "event": ("행사", "축제", "기념식", "경축식", "초대합니다", "페스티벌", "시민 참여", "광복", "문화", "공연", "전시"),
+    "event_debias": ("행사", "축제", "기념식", "페스티벌", "공연", "전시"),
+    "event_local": ("행사", "축제", "기념식", "페스티벌"),
+    "local_econ": ("농축산물", "전통시장", "온누리상품권", "하나로마트", "할인", "쿠폰", "소비진작", "환급"),
+    "reg": ("규제 완화", "규제완화", "제도 개선", "제도개선", "개정", "시행령", "시행규칙", "법안", "조례"),
+    "reg_debias": ("규제완화", "규제 완화", "제도개선", "제도 개선", "개정", "시행령", "시행규칙"),
+    "gov_strong": ("대통령", "국무회의", "국정", "국정운영", "청와대", "국무위원"),
+    "gov_weak": ("정부", "부처", "위원회", "정책", "정부합동", "국정브리핑"),
+}
+
+# pyahocorasick 이 있으면 모든 그룹의 키워드를 오토마톤 하나로 묶어 본문을 한 번만 훑는다
+if ahocorasick is not None:
+    _KW_AC = ahocorasick.Automaton()
+    _kw_owner: Dict[str, List[str]] = {}
+    for _name, _terms in _KW_GROUPS.items():
+        for _term in _terms:
+            _kw_owner.setdefault(_term, []).append(_name)
+    for _term, _names in _kw_owner.items():
+        _KW_AC.add_word(_term, tuple(_names))
+    _KW_AC.make_automaton()
+else:
+    _KW_AC = None
+# 오토마톤이 없을 때: 그룹마다 하나의 alternation 정규식
+_KW_RX = {name: re.compile("|".join(map(re.escape, terms))) for name, terms in _KW_GROUPS.items()}
+
+# _debias_primary 교정 순서: (키워드 그룹, 카테고리)
+_DEBIAS_TABLE: Tuple[Tuple[str, str], ...] = (
+    ("fin_debias", "투자_금융"),
+    ("export", "수출_글로벌"),
+    ("rnd", "연구_기술"),
+    ("hr", "인사_조직"),
+    ("safety_debias", "산업_기업"),
+)
+
+def _keyword_hits(t: str) -> frozenset:
+    """소문자 텍스트 t 에 키워드가 하나라도 나타나는 그룹 이름들."""
+    if _KW_AC is not None:
+        hits = set()
+        for _, names in _KW_AC.iter(t):
+            hits.update(names)
+        return frozenset(hits)
+    return frozenset(name for name, rx in _KW_RX.items() if rx.search(t))
+
+def _lower_text(text: Optional[str], title: Optional[str]) -> str:
+    """키워드 매칭용 "제목 본문" 소문자 텍스트(분류에서 기사당 한 번만 만든다)."""
+    return ((title or "") + " " + (text or "")).lower()
+
+def _llm_worthy(text: str, title: Optional[str]) -> bool:
+    """너무 짧거나 제목과 같은 본문(사진 설명 등)은 LLM 없이 룰베이스로 처리한다."""
+    return len(text) >= MIN_TEXT_CHARS and text != (title or "").strip()
+
+# 번호 없이 결과 하나만 돌아왔을 때 결과로 볼 키
+_RESULT_KEYS = ("summary_lines", "primary", "subcategories")
+
+def _results_by_id(js: dict, n_rows: int = 0) -> Dict[int, dict]:
+    """
+    배치 응답 {"results":[{"id":n,...}]} 을 기사 번호 → 결과 dict 로.
+    기사 한 건만 보냈으면 id 없는 결과 하나나 평평한 {"summary_lines":...} 도 1번 기사 결과로 받는다.
+    """
+    out: Dict[int, dict] = {}
+    results = js.get("results") if isinstance(js, dict) else None
+    if not isinstance(results, list):
+        results = []
+    for r in results:
+        if not isinstance(r, dict):
+            continue
+        try:
+            out[int(r.get("id"))] = r
+        except (TypeError, ValueError):
+            continue
+    if n_rows == 1 and 1 not in out:
+        dicts = [r for r in results if isinstance(r, dict)]
+        if len(dicts) == 1:
+            out[1] = dicts[0]
+        elif isinstance(js, dict) and any(k in js for k in _RESULT_KEYS):
+            out[1] = js
+    return out
+
 def safe_debug(msg: str):
     if DEBUG:
-        print(f"[DEBUG] {msg}")
+        # stdout 은 결과 출력(pipeline.py ... -)에 쓰일 수 있으므로 stderr 로
+        print(f"[DEBUG] {msg}", file=sys.stderr)
 
 def _pad4(xs: List[str]) -> List[str]:
-    xs = [x.strip() for x in (xs or []) if isinstance(x, str) and x.strip()]
-    xs = list(dict.fromkeys(xs))[:4]
-    while len(xs) < 4:
-        xs.append("")
-    return xs
+    # 중복 제거하며 앞에서부터 4개가 차면 바로 멈춘다
+    out: List[str] = []
+    seen = set()
+    for x in xs or []:
+        if not isinstance(x, str):
+            continue
+        x = x.strip()
+        if x and x not in seen:
+            seen.add(x)
+            out.append(x)
+            if len(out) == 4:
+                return out
+    while len(out) < 4:
+        out.append("")
+    return out
 
 def _normalize_primary(cat: Optional[str]) -> str:
     cat = (cat or "").strip()
@@ -87,10 +225,14 @@ def _normalize_primary(cat: Optional[str]) -> str:
     }
     return mapping.get(cat, "기타")
 
+def _collapse_ws(s: str) -> str:
+    """연속 공백을 하나로 접고 앞뒤 공백 제거(정규식 \s+ 치환 + strip 과 같은 결과)."""
+    return " ".join(s.split())
+
 def _normalize_subs(subs: List[str]) -> List[str]:
     cleaned = []
     for s in subs or []:
-        s = re.sub(r"\s+", " ", s).strip()
+        s = _collapse_ws(s)
         if not s:
             continue
         s = s.replace("R & D", "R&D").replace("r&d", "R&D")
@@ -100,22 +242,34 @@ def _normalize_subs(subs: List[str]) -> List[str]:
     return _pad4(cleaned)
 
 def _close_sentence(s: str) -> str:
-    s = s.strip()
+    s = _collapse_ws(s)
     if not s:
         return ""
-    s = re.sub(r"\s+", " ", s)
-    if re.search(r"[.!?]$", s) or re.search(r"(다|요|합니다|이다)$", s):
+    if _RX_END.search(s) or _RX_END_KO.search(s):
         return s
     return s.rstrip("…,:;") + "다"
 
+def _sentence_score(s: str) -> int:
+    """룰베이스 요약용 문장 점수. 신호마다 첫 매치에서 멈추는 search 가 합친 finditer 보다 빠르다."""
+    sc = 0
+    if _RX_SCORE_DATE.search(s): sc += 3
+    if _RX_SCORE_NUM.search(s): sc += 2
+    if _RX_SCORE_ORG.search(s): sc += 2
+    if _RX_SCORE_ACT.search(s): sc += 2
+    if len(s) >= 20: sc += 1
+    return sc
+
+# 문장 끝으로 보는 글자(뒤에 공백이 오면 끊는다)
+_SENT_ENDS = (".", "!", "?", "다")
+
 def _split_sentences_ko(text: str) -> List[str]:
-    blob = (text or "").strip()
+    # 공백을 하나로 접으면 줄바꿈이 남지 않으므로, '. ! ? 다' 뒤 공백을 줄바꿈으로 바꿔 그대로 자른다
+    blob = _collapse_ws(text or "")
     if not blob:
         return []
-    blob = re.sub(r"\s+", " ", blob)
-    sents = re.split(r"(?<=[\.!?]|다)\s+", blob)
-    sents = [s.strip() for s in sents if s and len(s.strip()) > 4]
-    return sents
+    for end in _SENT_ENDS:
+        blob = blob.replace(end + " ", end + "\n")
+    return [s for s in blob.split("\n") if len(s) > 4]
 
 # 간단 키워드 추출(품사기반 없이 빈도 기반)
 _STOPWORDS = {
@@ -124,11 +278,17 @@ _STOPWORDS = {
     "한다", "했다", "합니다", "이다", "한다는", "있는", "없는", "가장", "최대", "최소",
     "서울시", "부산시", "대구시", "인천시", "광주시", "대전시", "울산시", "세종시"
 }
+# 키워드 후보는 앞부분만 봐도 충분하다
+_KEYWORD_SCAN_CHARS = 1500
+
 def _auto_keywords(text: str, topk: int = 8) -> List[str]:
-    tokens = re.split(r"[^0-9A-Za-z가-힣]+", text or "")
-    tokens = [t for t in tokens if len(t) >= 2 and t not in _STOPWORDS]
-    cnt = Counter(tokens)
-    return [w for w, _ in cnt.most_common(topk)]
+    freq: Dict[str, int] = {}
+    get = freq.get
+    for t in _RX_TOKEN_SPLIT.split((text or "")[:_KEYWORD_SCAN_CHARS]):
+        if len(t) >= 2 and t not in _STOPWORDS:
+            freq[t] = get(t, 0) + 1
+    # most_common 과 같은 순서(빈도 내림차순, 동률은 먼저 나온 순)
+    return heapq.nlargest(topk, freq, key=freq.__getitem__)
 
 # ======================
 #   Processor
@@ -142,35 +302,130 @@ class Processor:
             self.llm = None
             safe_debug("[processors] 룰베이스 모드")
 
+    # -------- 일괄 처리 --------
+    def process_batch(self, items: List[Tuple[str, Optional[str]]], batch_size: int = 8, max_workers: int = 20) -> List[dict]:
+        """
+        (본문, 제목) 목록을 batch_size 건씩 묶어 요약/분류/지역 감지(입력 순서 유지).
+        LLM 모드에서는 묶음별 요약/분류 요청을 max_workers 스레드로 동시에 보내고, 호출 속도는 LLMClient 가 제한한다.
+        반환: [{"summary_lines", "category", "subcategories", "region"}, ...]
+        """
+        batch_size = max(1, batch_size)
+        chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        if not chunks:
+            return []
+        if DEBUG:
+            safe_debug(f"[processors] {len(items)}건을 {len(chunks)}묶음으로 처리")
+
+        # 지역은 묶음마다 한 번만 감지해 분류와 결과 레코드에 같이 쓴다
+        regions = [self._detect_regions(chunk) for chunk in chunks]
+        if self.llm is None:
+            # 룰베이스는 CPU 작업뿐이라 스레드 이득이 없다
+            summaries = [self.summarize_batch(chunk) for chunk in chunks]
+            categories = [self.classify_batch(chunk, rg) for chunk, rg in zip(chunks, regions)]
+        else:
+            # 묶음별 요약/분류 요청은 서로 독립 → 모두 한 풀의 태스크로 올려 네트워크 대기를 겹친다
+            with ThreadPoolExecutor(max_workers=min(max(1, max_workers), 2 * len(chunks))) as ex:
+                futs = [
+                    (ex.submit(self.summarize_batch, chunk), ex.submit(self.classify_batch, chunk, rg))
+                    for chunk, rg in zip(chunks, regions)
+                ]
+                summaries = [fs.result() for fs, _ in futs]
+                categories = [fc.result() for _, fc in futs]
+
+        out: List[dict] = []
+        for chunk_summaries, chunk_categories, chunk_regions in zip(summaries, categories, regions):
+            out.extend(
+                {
+                    "summary_lines": (lines or [])[:MAX_SUMMARY_LINES],
+                    "category": primary,
+                    "subcategories": subs,
+                    "region": region,
+                }
+                for lines, (primary, subs), region in zip(chunk_summaries, chunk_categories, chunk_regions)
+            )
+        return out
+
+    def _llm_rows(self, task: str, rows: List[Tuple[str, Optional[str]]], idx: List[int],
+                  build_prompt: Callable[[List[int]], str], tokens_per_row: int,
+                  convert: Callable[[int, dict], Any]) -> Dict[int, Any]:
+        """
+        rows[i] (i ∈ idx) 의 LLM 결과를 convert(i, 결과 dict) 로 변환해 {i: 값} 으로 반환.
+        기사(작업, 제목, 본문)별 캐시를 먼저 보고, 없는 기사만 중복 없이 번호를 붙여 한 프롬프트로 보낸다.
+        받은 결과는 기사별로 캐시에 저장(변환 결과가 비면 저장하지 않음).
+        """
+        found: Dict[int, Any] = {}
+        pending: Dict[str, List[int]] = {}  # 캐시 키 → 같은 기사의 행 번호들
+        for i in idx:
+            key = self.llm.result_key(task, rows[i][0], rows[i][1])
+            js = self.llm.cached_result(key)
+            val = convert(i, js) if js is not None else None
+            if val:
+                found[i] = val
+            else:
+                pending.setdefault(key, []).append(i)
+        if not pending:
+            return found
+
+        keys = list(pending)
+        try:
+            js = self.llm.json_chat(
+                build_prompt([pending[k][0] for k in keys]),
+                max_tokens=tokens_per_row * len(keys),
+                temperature=0.0,
+            )
+            by_id = _results_by_id(js, len(keys))
+            for n, key in enumerate(keys, start=1):
+                if n not in by_id:
+                    continue
+                stored = False
+                for i in pending[key]:
+                    val = convert(i, by_id[n])
+                    if val:
+                        found[i] = val
+                        if not stored:
+                            self.llm.store_result(key, by_id[n])
+                            stored = True
+        except Exception as e:
+            safe_debug(f"[processors] LLM {task} 실패({len(keys)}건) → 백업 사용: {e}")
+        return found
+
     # -------- 요약 --------
     def summarize(self, text: str, title: str = None) -> List[str]:
-        text = (text or "").strip()
-        if self.llm and len(text) >= 1:
-            try:
-                js = self.llm.json_chat(
-                    self._summary_prompt(text, title),
-                    max_tokens=420
-                ) or {}
-                lines = js.get("summary_lines") or []
-                lines = [ln for ln in lines if isinstance(ln, str)]
-                lines = [_close_sentence(ln) for ln in lines if ln.strip()]
-                if len(lines) >= 1:
-                    return (lines + ["", "", ""])[:MAX_SUMMARY_LINES]
-            except Exception as e:
-                safe_debug(f"[processors] LLM 요약 실패 → 백업 사용: {e}")
-        return self._fallback_summary(text, title)
+        return self.summarize_batch([(text, title)])[0]
+
+    def summarize_batch(self, items: List[Tuple[str, Optional[str]]]) -> List[List[str]]:
+        """
+        (본문, 제목) 여러 건을 번호를 붙여 한 프롬프트로 요약(LLM 1회).
+        응답에서 빠진 기사는 한 건씩 다시 요청하고, 그래도 안 되면 룰베이스.
+        """
+        rows = [((text or "").strip(), title) for text, title in items]
+        out: Dict[int, List[str]] = {}
+        if self.llm:
+            idx = [i for i, (text, title) in enumerate(rows) if _llm_worthy(text, title)]
+            if idx:
+                out.update(self._llm_rows(
+                    "summary", rows, idx,
+                    lambda ids: self._summary_prompt([rows[i] for i in ids]),
+                    420,
+                    lambda i, js: self._summary_from_llm(js),
+                ))
+                if len(idx) > 1:
+                    for i in idx:
+                        if i not in out:
+                            out[i] = self.summarize(*rows[i])
+        return [out.get(i) or self._fallback_summary(text, title) for i, (text, title) in enumerate(rows)]
+
+    def _summary_from_llm(self, js: dict) -> List[str]:
+        lines = js.get("summary_lines") or []
+        lines = [ln for ln in lines if isinstance(ln, str)]
+        lines = [_close_sentence(ln) for ln in lines if ln.strip()]
+        if len(lines) >= 1:
+            return (lines + ["", "", ""])[:MAX_SUMMARY_LINES]
+        return []
 
     def _fallback_summary(self, text: str, title: str = None) -> List[str]:
         sents = _split_sentences_ko(text)
-        def score(s: str) -> int:
-            sc = 0
-            if re.search(r"\d{4}년|\d+월|\d+일|\d+%", s): sc += 3
-            if re.search(r"[0-9][0-9,\.]{0,6}", s): sc += 2
-            if re.search(r"(부|청|처|원|공사|위원회|정부|부처)", s): sc += 2
-            if re.search(r"(지원|확대|개선|도입|발표|시행|확정|투자|수출|안전|출시)", s): sc += 2
-            if len(s) >= 20: sc += 1
-            return sc
-        picked = sorted(sents, key=score, reverse=True)[:MAX_SUMMARY_LINES]
+        picked = sorted(sents, key=_sentence_score, reverse=True)[:MAX_SUMMARY_LINES]
         if title and title.strip():
             if not picked or title.strip() not in picked[0]:
                 picked.insert(0, title.strip())
@@ -179,45 +434,69 @@ class Processor:
             picked.append("")
         return picked[:MAX_SUMMARY_LINES]
 
-    def _summary_prompt(self, text: str, title: str = None) -> str:
+    def _summary_prompt(self, rows: List[Tuple[str, Optional[str]]]) -> str:
+        articles = "\n\n".join(
+            f"[{n}] 제목: {title or ''}\n본문:\n{text[:_PROMPT_TEXT_CHARS]}" for n, (text, title) in enumerate(rows, start=1)
+        )
         return (
-            "너는 한국어 뉴스 요약기다. 아래 기사를 완결된 문장 3줄로 요약하라.\n"
+            "너는 한국어 뉴스 요약기다. 아래 번호가 붙은 기사 각각을 완결된 문장 3줄로 요약하라.\n"
             "- 정확히 3줄, 각 줄은 독립적인 핵심 문장으로 끝맺음(다/이다/합니다 등).\n"
             "- 숫자(날짜·비율·횟수), 기관·정책명, 조치/영향을 우선 포함.\n"
             "- 불필요한 인용부호·이모지·머리표·중복 금지. 문장 중간 생략 금지.\n"
-            'JSON만 출력: {"summary_lines": ["...", "...", "..."]}\n'
-            f"제목: {title or ''}\n본문:\n{text[:7000]}"
+            'JSON만 출력: {"results": [{"id": 1, "summary_lines": ["...", "...", "..."]}, ...]} (기사마다 1개, id 는 기사 번호)\n\n'
+            f"{articles}"
         )
 
     # -------- 분류 --------
     def classify(self, text: str, title: str = None) -> Tuple[str, List[str]]:
-        blob = f"{title or ''}\n{text or ''}".strip()
-        region = self.detect_region(text, title)
+        return self.classify_batch([(text, title)])[0]
+
+    def classify_batch(self, items: List[Tuple[str, Optional[str]]], regions: Optional[List[str]] = None) -> List[Tuple[str, List[str]]]:
+        """
+        (본문, 제목) 여러 건을 번호를 붙여 한 프롬프트로 분류(LLM 1회).
+        응답에서 빠진 기사는 한 건씩 다시 요청하고, 그래도 안 되면 룰베이스.
+        regions: 호출 측에서 이미 감지한 지역(없으면 여기서 감지)
+        """
+        # 지역과 키워드 매칭용 소문자 텍스트는 기사당 한 번만 만든다
+        if regions is None:
+            regions = self._detect_regions(items)
+        lowered = [_lower_text(text, title) for text, title in items]
+        out: Dict[int, Tuple[str, List[str]]] = {}
 
         # LLM 우선 + 엄격 프롬프트
-        if self.llm and len(blob) >= 1:
-            try:
-                js = self.llm.json_chat(
-                    self._category_prompt(text, title, region),
-                    max_tokens=300
-                ) or {}
-                primary = _normalize_primary(js.get("primary"))
-                subs = _normalize_subs(js.get("subcategories") or [])
-
-                # 정책_정부 치우침 방지: 강한 비정책 신호가 있으면 교정
-                primary = self._debias_primary(primary, text, title, region)
-
-                # 서브카테고리 4개 채우기(자동 키워드 보강)
-                if subs.count("") > 0:
-                    auto = self._suggest_subs_from_text(text, title, region, primary)
-                    subs = _normalize_subs(subs + auto)
-
-                return primary, subs
-            except Exception as e:
-                safe_debug(f"[processors] LLM 분류 실패 → 백업 사용: {e}")
+        if self.llm:
+            idx = [i for i, (text, title) in enumerate(items) if _llm_worthy((text or "").strip(), title)]
+            if idx:
+                out.update(self._llm_rows(
+                    "category", items, idx,
+                    lambda ids: self._category_prompt([(items[i][0], items[i][1], regions[i]) for i in ids]),
+                    300,
+                    lambda i, js: self._classify_from_llm(js, items[i][0], items[i][1], regions[i], lowered[i]),
+                ))
+                if len(idx) > 1:
+                    for i in idx:
+                        if i not in out:
+                            out[i] = self.classify(*items[i])
 
         # LLM 불가 시 룰베이스
-        return self._fallback_classify(text, title, region)
+        return [
+            out.get(i) or self._fallback_classify(text, title, region, t_lower)
+            for i, ((text, title), region, t_lower) in enumerate(zip(items, regions, lowered))
+        ]
+
+    def _classify_from_llm(self, js: dict, text: str, title: str, region: str, t_lower: str) -> Tuple[str, List[str]]:
+        primary = _normalize_primary(js.get("primary"))
+        subs = _normalize_subs(js.get("subcategories") or [])
+
+        # 정책_정부 치우침 방지: 강한 비정책 신호가 있으면 교정
+        primary = self._debias_primary(primary, t_lower, region)
+
+        # 서브카테고리 4개 채우기(자동 키워드 보강)
+        if subs.count("") > 0:
+            auto = self._suggest_subs_from_text(text, title, region, primary)
+            subs = _normalize_subs(subs + auto)
+
+        return primary, subs
 
     def _suggest_subs_from_text(self, text: str, title: str, region: str, primary: str) -> List[str]:
         base = (title or "") + " " + (text or "")
@@ -243,7 +522,7 @@ class Processor:
 
         # 후보 결합
         out = []
-        for k in prefer + keys + _SUBCATEGORY_HINTS:
+        for k in chain(prefer, keys, _SUBCATEGORY_HINTS):
             k = k.strip()
             if not k or k in out:
                 continue
@@ -252,77 +531,65 @@ class Processor:
                 break
         return out
 
-    def _debias_primary(self, primary: str, text: str, title: str, region: str) -> str:
-        t = ((title or "") + " " + (text or "")).lower()
+    def _debias_primary(self, primary: str, t: str, region: str) -> str:
+        """t: _lower_text(본문, 제목)"""
+        hits = _keyword_hits(t)
 
-        def has_any(terms: List[str]) -> bool:
-            return any(term in t for term in terms)
-
-        # 강한 도메인 신호가 있으면 해당 카테고리로 교정
-        if has_any(["보험", "대출", "연체", "금융", "펀드", "증권", "보조금", "세제"]):
-            return "투자_금융"
-        if has_any(["수출", "무역", "해외", "글로벌", "fta"]):
-            return "수출_글로벌"
-        if has_any(["r&d", "연구", "기술", "ai", "인공지능", "혁신", "디지털전환"]):
-            return "연구_기술"
-        if has_any(["채용", "고용", "임금", "노사", "근로시간"]):
-            return "인사_조직"
-        if has_any(["산업재해", "산재", "중대재해", "산업안전"]):
-            return "산업_기업"
+        # 강한 도메인 신호가 있으면 해당 카테고리로 교정(표 순서가 우선순위)
+        for group, cat in _DEBIAS_TABLE:
+            if group in hits:
+                return cat
 
         # 지역행사/축제/문화 + 지역명 → 사회로 교정
-        if region != "전국" and has_any(["행사", "축제", "기념식", "페스티벌", "공연", "전시"]):
+        if region != "전국" and "event_debias" in hits:
             return "사회"
 
         # 규제/제도 신호
-        if has_any(["규제완화", "규제 완화", "제도개선", "제도 개선", "개정", "시행령", "시행규칙"]):
+        if "reg_debias" in hits:
             return "규제_제도"
 
         # 특별히 교정할 신호가 없으면 그대로
         return primary
 
-    def _fallback_classify(self, text: str, title: str = None, region: str = "전국") -> Tuple[str, List[str]]:
-        t_orig = (title or "") + " " + (text or "")
-        t = t_orig.lower()
+    def _fallback_classify(self, text: str, title: str = None, region: str = "전국", t_lower: Optional[str] = None) -> Tuple[str, List[str]]:
+        hits = _keyword_hits(_lower_text(text, title) if t_lower is None else t_lower)
 
         subs: List[str] = []
         scores = {k: 0 for k in _PRIMARY_CATEGORIES}
         def bump(cat: str, n: int = 1): scores[cat] = scores.get(cat, 0) + n
-        def has_any(terms: List[str]) -> bool:
-            return any(term in t for term in terms)
 
         # 강한 신호
-        if has_any(["대출", "은행", "보험", "카드", "신용", "금감원", "채무조정", "연체", "보험료", "금융지원", "보조금", "세제"]):
+        if "fin" in hits:
             bump("투자_금융", 5); subs += ["금융지원", "세제"]
-        if has_any(["산업재해", "산재", "중대재해", "노동안전", "안전사고", "산업안전"]):
+        if "safety" in hits:
             bump("산업_기업", 5); subs += ["안전관리"]
-        if has_any(["수출", "무역", "해외", "글로벌", "fta"]):
+        if "export" in hits:
             bump("수출_글로벌", 5); subs += ["수출"]
-        if has_any(["r&d", "연구", "기술", "ai", "인공지능", "혁신", "디지털전환"]):
+        if "rnd" in hits:
             bump("연구_기술", 5); subs += ["R&D", "AI"]
-        if has_any(["채용", "고용", "임금", "노사", "근로시간"]):
+        if "hr" in hits:
             bump("인사_조직", 4); subs += ["채용"]
 
         # 사회/행사
-        if has_any(["행사", "축제", "기념식", "경축식", "초대합니다", "페스티벌", "시민 참여", "광복", "문화", "공연", "전시"]):
+        if "event" in hits:
             bump("사회", 4); subs += ["행사", "문화"]
 
         # 지역경제/소비 진작
-        if has_any(["농축산물", "전통시장", "온누리상품권", "하나로마트", "할인", "쿠폰", "소비진작", "환급"]):
+        if "local_econ" in hits:
             bump("사회", 3); subs += ["지역경제"]
 
         # 규제/제도
-        if has_any(["규제 완화", "규제완화", "제도 개선", "제도개선", "개정", "시행령", "시행규칙", "법안", "조례"]):
+        if "reg" in hits:
             bump("규제_제도", 3); subs += ["제도개선", "규제완화"]
 
         # 정책/정부는 기본 낮게, 강한 신호만 가산
-        if has_any(["대통령", "국무회의", "국정", "국정운영", "청와대", "국무위원"]):
+        if "gov_strong" in hits:
             bump("정책_정부", 3); subs += ["정책"]
-        if has_any(["정부", "부처", "위원회", "정책", "정부합동", "국정브리핑"]):
+        if "gov_weak" in hits:
             bump("정책_정부", 1); subs += ["정책"]
 
         # 지역행사 + 지역명 → 사회 가산
-        if region != "전국" and has_any(["행사", "축제", "기념식", "페스티벌"]):
+        if region != "전국" and "event_local" in hits:
             bump("사회", 2)
 
         # 타이브레이커
@@ -344,35 +611,50 @@ class Processor:
 
         return primary, subs
 
-    def _category_prompt(self, text: str, title: str = None, region: str = "전국") -> str:
+    def _category_prompt(self, rows: List[Tuple[str, Optional[str], str]]) -> str:
         cats = ", ".join(_PRIMARY_CATEGORIES)
-        guide = json.dumps(_CATEGORY_GUIDE, ensure_ascii=False, indent=2)
         hints = ", ".join(_SUBCATEGORY_HINTS)
-        region_hint = f"(참고 지역: {region})" if region else ""
+        articles = "\n\n".join(
+            f"[{n}] 제목: {title or ''}" + (f" (참고 지역: {region})" if region else "") + f"\n본문:\n{(text or '')[:_PROMPT_TEXT_CHARS]}"
+            for n, (text, title, region) in enumerate(rows, start=1)
+        )
         return (
-            "너는 한국어 뉴스 분류기다. 다음 기사에 대해 **주카테고리 정확히 1개**와 **서브카테고리 정확히 4개**를 JSON으로만 출력하라.\n"
+            "너는 한국어 뉴스 분류기다. 아래 번호가 붙은 기사 각각에 대해 **주카테고리 정확히 1개**와 **서브카테고리 정확히 4개**를 JSON으로만 출력하라.\n"
             f"- 주카테고리 후보: [{cats}]\n"
-            f"- 카테고리 가이드:\n{guide}\n"
+            f"- 카테고리 가이드:\n{_CATEGORY_GUIDE_JSON}\n"
             f"- 서브카테고리 예시(자유 조합): [{hints}]\n"
             "- 규칙:\n"
             "  1) 본문 도메인 신호가 강하면 해당 도메인을 우선(예: 금융/보험/대출 → 투자_금융, 수출/무역 → 수출_글로벌, R&D/AI → 연구_기술, 채용/임금/노사 → 인사_조직, 지역행사/축제 → 사회).\n"
             "  2) 단지 '정부/정책'이라는 단어가 포함되었다고 해서 무조건 정책_정부로 분류하지 말 것.\n"
             "  3) 서브카테고리는 중복/유사어 금지, 실제 기사 핵심 키워드 4개로만 구성.\n"
             "  4) 출력은 JSON 하나만. 추가 설명/주석 금지.\n"
-            f"{region_hint}\n"
-            '출력 예시: {"primary":"사회","subcategories":["행사","문화","지역경제","지자체"]}\n'
-            f"제목: {title or ''}\n본문:\n{text[:7000]}"
+            '출력 예시: {"results": [{"id": 1, "primary": "사회", "subcategories": ["행사", "문화", "지역경제", "지자체"]}]} (기사마다 1개, id 는 기사 번호)\n\n'
+            f"{articles}"
         )
 
     # -------- 지역 검출 --------
+    def _detect_regions(self, items: List[Tuple[str, Optional[str]]]) -> List[str]:
+        return [self.detect_region_from_blob(f"{title or ''}\n{text or ''}") for text, title in items]
+
     def detect_region(self, text: str, title: str = None) -> str:
-        blob = f"{title or ''}\n{text or ''}"
-        for alias, base in _REGION_ALIASES.items():
-            if alias in blob:
-                return base
-        for kw in _REGION_KWS:
-            if kw in blob:
-                return kw
+        return self.detect_region_from_blob(f"{title or ''}\n{text or ''}")
+
+    def detect_region_from_blob(self, blob: str) -> str:
+        """blob: "제목\n본문" 형태로 이미 합쳐 둔 텍스트"""
+        if _REGION_AC is not None:
+            best = None
+            for _, (prio, region) in _REGION_AC.iter(blob):
+                if best is None or prio < best[0]:
+                    best = (prio, region)
+                    if prio == 0:
+                        break
+            return best[1] if best else "전국"
+        found = {m.group(0) for m in _REGION_ALIAS_RX.finditer(blob)}
+        if found:
+            return _REGION_ALIASES[min(found, key=_REGION_ALIAS_PRIO.__getitem__)]
+        found = {m.group(0) for m in _REGION_KW_RX.finditer(blob)}
+        if found:
+            return min(found, key=_REGION_KW_PRIO.__getitem__)
         return "전국"
 
 def build_processor() -> "Processor":
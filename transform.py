@@ -1,20 +1,65 @@
 # -*- coding: utf-8 -*-
 import re
 from html import unescape
+from typing import Tuple
 
 _TAG_RX = re.compile(r"<[a-zA-Z][^>]*>")
+# 1차: script/style 블록(→ 공백) | <br>, </p> (→ 줄바꿈) 를 한 번의 스캔으로, 2차: 남은 태그(→ 공백)
+# 남은 태그를 1차에 합치면 짝 없는 '<' 가 뒤의 <br>/</p> 까지 삼켜 결과가 달라지므로 나눠 둔다
+_BLOCK_RX = re.compile(r"<(script|style).*?>.*?</\1>|(<br\s*/?>|</p\s*>)", re.IGNORECASE | re.DOTALL)
+_ANY_TAG_RX = re.compile(r"<.*?>", re.DOTALL)
+_WS_RX = re.compile(r"[ \t]+")
+_NL_RX = re.compile(r"\n\s*\n\s*\n+")
+
+def _tag_repl(m: re.Match) -> str:
+    return "\n" if m.group(2) else " "
+
+def _clean_text(text: str) -> str:
+    text = unescape(text)
+    text = _WS_RX.sub(" ", text)
+    text = _NL_RX.sub("\n\n", text)
+    return text.strip()
 
 def strip_html(html: str) -> str:
     if not html:
         return ""
-    text = re.sub(r"<(script|style).*?>.*?</\1>", " ", html, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"</p\s*>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<.*?>", " ", text, flags=re.DOTALL)
-    text = unescape(text)
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
-    return text.strip()
+    # 태그가 없으면 정규식 엔진을 건너뛰고 엔티티/공백만 정리
+    if "<" in html:
+        text = _ANY_TAG_RX.sub(" ", _BLOCK_RX.sub(_tag_repl, html))
+    else:
+        text = html
+    return _clean_text(text)
+
+def strip_html_and_flag(html: str) -> Tuple[str, bool]:
+    """strip_html 결과와 has_html 여부를 태그 제거 스캔에서 함께 구한다."""
+    if not html:
+        return "", False
+    if "<" not in html:
+        return _clean_text(html), False
+    had = False
+
+    def block_repl(m: re.Match) -> str:
+        nonlocal had
+        if m.group(2):
+            # <br> 은 태그, </p> 는 _TAG_RX 기준으로 태그가 아니다
+            had = had or m.group(0)[1] != "/"
+            return "\n"
+        had = True  # <script>/<style> 여는 태그
+        return " "
+
+    def tag_repl(m: re.Match) -> str:
+        nonlocal had
+        if not had:
+            # 남은 '<' 로 시작하는 구간 안에서만 _TAG_RX 조건을 확인한다
+            c = m.group(0)[1:2]
+            had = (c.isascii() and c.isalpha()) or bool(_TAG_RX.search(m.group(0)))
+        return " "
+
+    text = _ANY_TAG_RX.sub(tag_repl, _BLOCK_RX.sub(block_repl, html))
+    if not had:
+        # 태그가 </p> 치환과 겹친 드문 경우까지 has_html 과 같게 원문으로 확인
+        had = bool(_TAG_RX.search(html))
+    return _clean_text(text), had
 
 def has_html(contents: str) -> bool:
     if not contents:
@@ -22,15 +67,15 @@ def has_html(contents: str) -> bool:
     return bool(_TAG_RX.search(contents))
 
 def normalize_items(items):
-    norm = []
-    for it in items:
-        contents = it.get("contents") or ""
-        plain = strip_html(contents)
-        norm.append({
+    return [
+        {
             "NewsItemId": it.get("NewsItemId"),
             "title": it.get("title"),
             "contents": contents,
             "plain_text": plain,
-            "has_html": has_html(contents),
-        })
-    return norm
+            "has_html": flag,
+        }
+        for it in items
+        for contents in (it.get("contents") or "",)
+        for plain, flag in (strip_html_and_flag(contents),)
+    ]